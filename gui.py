@@ -1,14 +1,31 @@
 import functools
+import operator
+import random
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 from typing import List
 
+# Number of option buttons created up front (the pool grows if a turn needs more)
+MOVE_BUTTON_POOL = 32
+
 # --- Global Game State Management ---
 current_heaps: List[int] = []
 
 def calculate_nim_sum(heaps: List[int]) -> int:
     """Calculates the bitwise XOR (Nim-sum) of all heap sizes."""
-    return functools.reduce(lambda x, y: x ^ y, heaps) if heaps else 0
+    # Typical games have only a few heaps: inline the XOR chain for those
+    n = len(heaps)
+    if n == 0:
+        return 0
+    if n == 1:
+        return heaps[0]
+    if n == 2:
+        return heaps[0] ^ heaps[1]
+    if n == 3:
+        return heaps[0] ^ heaps[1] ^ heaps[2]
+    if n == 4:
+        return heaps[0] ^ heaps[1] ^ heaps[2] ^ heaps[3]
+    return functools.reduce(operator.xor, heaps, 0)
 
 class NimAdvisorApp:
     def __init__(self, master):
@@ -18,7 +35,9 @@ class NimAdvisorApp:
         global current_heaps
         self.heaps = current_heaps
         self.turn_count = 0
+        self.nim_sum = 0
         self.move_options = []
+        self._log_buf: List[str] = []
 
         # --- Configure Grid Layout ---
         master.columnconfigure(0, weight=1)
@@ -37,6 +56,10 @@ class NimAdvisorApp:
         ttk.Button(self.control_frame, text="Start Game", command=self.start_new_game).pack(side=tk.LEFT, padx=(10, 0))
         
         # --- 2. Status Display ---
+        # One style per status colour, so a status change is a style swap rather than a restyle
+        style = ttk.Style(master)
+        for name, colour in (('Red', 'red'), ('Green', 'green'), ('Purple', 'purple')):
+            style.configure(f'{name}.TLabel', foreground=colour, font=('Helvetica', 10, 'bold'))
         self.status_var = tk.StringVar(value="Start a new game to begin tracking moves.")
         self.status_label = ttk.Label(master, textvariable=self.status_var, font=('Helvetica', 10, 'bold'), padding="5")
         self.status_label.grid(row=1, column=0, sticky="ew")
@@ -45,6 +68,17 @@ class NimAdvisorApp:
         self.move_frame = ttk.Frame(master, padding="10")
         self.move_frame.grid(row=2, column=0, sticky="w") # Changed sticky to 'w' for column layout
         ttk.Label(self.move_frame, text="Your Move Options:").grid(row=0, column=0, sticky="w", pady=(0, 5))
+
+        # Move widgets are created once and shown/hidden each turn instead of being rebuilt
+        # Pool slot i always applies option i, so each button's command is bound once here
+        self._move_btns = [ttk.Button(self.move_frame, command=lambda i=i: self.apply_optimal_move(i)) for i in range(MOVE_BUTTON_POOL)]
+        self.opp_heap_label = ttk.Label(self.move_frame, text="Heap Index (1, 2, ...):")
+        self.opp_heap_entry = ttk.Entry(self.move_frame, width=5)
+        self.opp_remove_label = ttk.Label(self.move_frame, text="Amount to Remove:")
+        self.opp_remove_entry = ttk.Entry(self.move_frame, width=5)
+        self.opp_log_btn = ttk.Button(self.move_frame, text="Log Opponent Move", command=self.apply_opponent_move)
+        self.random_move_label = ttk.Label(self.move_frame, foreground='gray')
+        self._transient_widgets: List[tk.Widget] = [] # Pooled widgets currently on the grid
         
         # --- 4. Game Log (Scrolled Text Area) ---
         ttk.Label(master, text="Game Log / Strategy Trace:").grid(row=3, column=0, sticky="sw", padx=10, pady=(10, 0))
@@ -56,13 +90,21 @@ class NimAdvisorApp:
 
     # --- Logging Functions ---
     def log_move(self, text: str):
-        """Helper to append text to the game log area."""
+        """Helper to queue text for the game log area (written by flush_log)."""
+        self._log_buf.append(text)
+
+    def flush_log(self):
+        """Writes all queued log lines to the game log area in one insert."""
+        if not self._log_buf:
+            return
         self.log_area.config(state=tk.NORMAL)
-        self.log_area.insert(tk.END, text + "\n")
+        self.log_area.insert(tk.END, "\n".join(self._log_buf) + "\n")
         self.log_area.see(tk.END) # Scroll to the bottom
         self.log_area.config(state=tk.DISABLED)
+        self._log_buf.clear()
         
     def clear_log(self):
+        self._log_buf.clear()
         self.log_area.config(state=tk.NORMAL)
         self.log_area.delete('1.0', tk.END)
         self.log_area.config(state=tk.DISABLED)
@@ -70,23 +112,28 @@ class NimAdvisorApp:
     # --- Game Start ---
     def start_new_game(self):
         input_str = self.start_input.get().strip()
-        try:
-            new_heaps = [int(h.strip()) for h in input_str.split() if h.strip().isdigit()]
-            new_heaps = [h for h in new_heaps if h > 0]
-            
-            if not new_heaps:
-                self.status_var.set("ERROR: Invalid starting heaps.")
-                return
+        new_heaps = []
+        for tok in input_str.split():
+            if tok.isdigit():
+                try:
+                    v = int(tok)
+                except ValueError: # isdigit() also accepts characters like '²' that int() rejects
+                    self.status_var.set("ERROR: Invalid input format. Check your numbers.")
+                    return
+                if v > 0:
+                    new_heaps.append(v)
+        
+        if not new_heaps:
+            self.status_var.set("ERROR: Invalid starting heaps.")
+            return
 
-            self.heaps = new_heaps
-            self.turn_count = 0
-            self.clear_log()
-            self.log_move("--- GAME STARTED ---")
-            self.log_move(f"INITIAL POSITION: {self.heaps}")
-            self.analyze_current_state(player="Player 1 (You)")
-            
-        except Exception:
-            self.status_var.set("ERROR: Invalid input format. Check your numbers.")
+        self.heaps = new_heaps
+        self.nim_sum = calculate_nim_sum(self.heaps)
+        self.turn_count = 0
+        self.clear_log()
+        self.log_move("--- GAME STARTED ---")
+        self.log_move(f"INITIAL POSITION: {self.heaps}")
+        self.analyze_current_state(player="Player 1 (You)")
 
     # --- State Analysis ---
     def analyze_current_state(self, player: str):
@@ -94,43 +141,51 @@ class NimAdvisorApp:
         self.turn_count += 1
         
         heaps = self.heaps
-        nim_sum = calculate_nim_sum(heaps)
+        nim_sum = self.nim_sum
         
         self.log_move(f"\n--- Turn {self.turn_count} ({player}'s Turn) ---")
         self.log_move(f"Current State: {heaps} | Nim-sum: {nim_sum}")
         
-        # Clear old move buttons (only buttons)
-        for widget in self.move_frame.winfo_children():
-            # Keep the "Your Move Options" Label (row 0, col 0)
-            if widget.grid_info().get('row', -1) > 0 or widget.grid_info().get('column', -1) > 0:
-                 widget.destroy()
+        # Hide old move widgets (the "Your Move Options" label stays)
+        self.hide_move_widgets()
 
         if nim_sum == 0:
             # LOSING POSITION (P-Position)
             self.status_var.set("STATUS: LOSING POSITION (Nim-sum = 0). Opponent is winning.")
-            self.status_label.config(foreground='red')
+            self.status_label.configure(style='Red.TLabel')
             
             self.log_move("STRATEGY: P-Position. You must make any legal move.")
             self.log_move("Please enter your chosen move into the 'Opponent Move' entry below and click 'Log Move'.")
             
             self.add_opponent_input()
-            self.add_random_move_button()
             
         else:
             # WINNING POSITION (N-Position)
             self.status_var.set("STATUS: WINNING POSITION (Nim-sum ≠ 0). You can force a win.")
-            self.status_label.config(foreground='green')
+            self.status_label.configure(style='Green.TLabel')
             
             self.move_options = self.find_optimal_moves(heaps, nim_sum)
             self.log_move("STRATEGY: N-Position. Choose an optimal move below:")
 
-            # Add buttons for optimal moves in a COLUMN
+            # Show pooled buttons for optimal moves in a COLUMN
+            while len(self._move_btns) < len(self.move_options):
+                self._move_btns.append(ttk.Button(self.move_frame, command=lambda i=len(self._move_btns): self.apply_optimal_move(i)))
             for idx, move in enumerate(self.move_options):
                 btn_text = f"Option {idx + 1}: Remove {move['remove_amount']} from Heap {move['heap_index']} (New size: {move['new_size']})"
-                action = functools.partial(self.apply_optimal_move, idx)
                 
                 # Place each button in a new row (column 0)
-                ttk.Button(self.move_frame, text=btn_text, command=action).grid(row=idx + 1, column=0, sticky="w", pady=2, padx=10)
+                btn = self._move_btns[idx]
+                btn.config(text=btn_text)
+                btn.grid(row=idx + 1, column=0, sticky="w", pady=2, padx=10)
+                self._transient_widgets.append(btn)
+
+        self.flush_log()
+
+    def hide_move_widgets(self):
+        """Removes the shown move widgets from the grid without destroying them."""
+        for widget in self._transient_widgets:
+            widget.grid_remove()
+        self._transient_widgets.clear()
 
 
     # --- Rest of the class methods remain the same, but need adjustment for grid layout in move_frame ---
@@ -139,9 +194,14 @@ class NimAdvisorApp:
     def find_optimal_moves(self, heaps, nim_sum):
         """Finds all optimal moves (S' = 0)."""
         optimal_moves = []
+        if nim_sum == 0:
+            return optimal_moves
+
+        # heap ^ nim_sum < heap exactly when the heap has the top set bit of nim_sum
+        msb = 1 << (nim_sum.bit_length() - 1)
         for i, heap_size in enumerate(heaps):
-            target_size = heap_size ^ nim_sum
-            if target_size < heap_size:
+            if heap_size & msb:
+                target_size = heap_size ^ nim_sum
                 optimal_moves.append({
                     'heap_index': i + 1,
                     'current_size': heap_size,
@@ -156,19 +216,19 @@ class NimAdvisorApp:
         """Applies the user's selected optimal move."""
         move = self.move_options[move_index]
         
-        # Update the heap state
+        # Update the heap state (changing one heap from a to b XORs a ^ b into the Nim-sum)
         self.heaps[move['heap_true_index']] = move['new_size']
+        self.nim_sum ^= move['current_size'] ^ move['new_size']
         
         self.log_move(f"PLAYER 1 MOVED (Option {move_index + 1}): Removed {move['remove_amount']} from Heap {move['heap_index']}.")
         
         # Check for game end
-        if all(h == 0 for h in self.heaps):
+        if not any(self.heaps):
             self.end_game("Player 1 (You) Win!")
             return
             
         # Log the state after player's move
-        self.heaps = [h for h in self.heaps if h > 0] # Remove 0 heaps
-        self.log_move(f"New State: {self.heaps} (Nim-sum: {calculate_nim_sum(self.heaps)})")
+        self.log_move(f"New State: {self.heaps} (Nim-sum: {self.nim_sum})")
         
         # Proceed to Opponent's turn
         self.analyze_current_state(player="Opponent (Computer)")
@@ -176,40 +236,47 @@ class NimAdvisorApp:
     # --- Opponent Move Simulation (Manual/Simple Random) ---
     def add_opponent_input(self):
         """Adds controls for the user to input the opponent's move."""
-        # Clear existing move buttons and labels
-        for widget in self.move_frame.winfo_children():
-            if widget.grid_info().get('row', -1) > 0 or widget.grid_info().get('column', -1) > 0:
-                 widget.destroy()
+        # Hide existing move buttons and labels
+        self.hide_move_widgets()
+
+        # Show the pooled widgets using grid, with empty entries
+        self.opp_heap_entry.delete(0, tk.END)
+        self.opp_remove_entry.delete(0, tk.END)
 
-        # Place new widgets using grid
         r = 1
-        ttk.Label(self.move_frame, text="Heap Index (1, 2, ...):").grid(row=r, column=0, sticky="w", padx=10)
-        self.opp_heap_entry = ttk.Entry(self.move_frame, width=5)
+        self.opp_heap_label.grid(row=r, column=0, sticky="w", padx=10)
         self.opp_heap_entry.grid(row=r, column=1, sticky="w", padx=5)
         
         r += 1
-        ttk.Label(self.move_frame, text="Amount to Remove:").grid(row=r, column=0, sticky="w", padx=10)
-        self.opp_remove_entry = ttk.Entry(self.move_frame, width=5)
+        self.opp_remove_label.grid(row=r, column=0, sticky="w", padx=10)
         self.opp_remove_entry.grid(row=r, column=1, sticky="w", padx=5)
         
         r += 1
-        ttk.Button(self.move_frame, text="Log Opponent Move", command=self.apply_opponent_move).grid(row=r, column=0, columnspan=2, pady=5, padx=10)
+        self.opp_log_btn.grid(row=r, column=0, columnspan=2, pady=5, padx=10)
+        self._transient_widgets.extend((self.opp_heap_label, self.opp_heap_entry, self.opp_remove_label,
+                                        self.opp_remove_entry, self.opp_log_btn))
         
-        self.add_random_move_button()
+        self.add_random_move_button(row=r + 1)
 
 
-    def add_random_move_button(self):
+    def add_random_move_button(self, row):
         """Helper to let the user see what a random legal move is."""
-        import random
-        legal_moves = []
-        for i, h in enumerate(self.heaps):
-            for r in range(1, h + 1):
-                legal_moves.append((i + 1, r))
+        sizes = self.heaps
+        total = sum(sizes)
         
-        r = self.move_frame.grid_size()[1] # Get current highest row
-        if legal_moves:
-            random_move = random.choice(legal_moves)
-            ttk.Label(self.move_frame, text=f"(e.g. Random Move: Heap {random_move[0]}, Remove {random_move[1]})", foreground='gray').grid(row=r, column=0, columnspan=2, sticky="w", padx=10)
+        if total:
+            # Pick a heap weighted by its size, then a uniform amount: same
+            # distribution as choosing among all legal moves, without listing them
+            pick = random.randrange(total)
+            idx = 0
+            cumulative = sizes[0]
+            while pick >= cumulative:
+                idx += 1
+                cumulative += sizes[idx]
+            amount = random.randint(1, sizes[idx])
+            self.random_move_label.config(text=f"(e.g. Random Move: Heap {idx + 1}, Remove {amount})")
+            self.random_move_label.grid(row=row, column=0, columnspan=2, sticky="w", padx=10)
+            self._transient_widgets.append(self.random_move_label)
 
 
     def apply_opponent_move(self):
@@ -225,23 +292,27 @@ class NimAdvisorApp:
             heap_true_index = heap_index - 1
             current_size = self.heaps[heap_true_index]
             
+            if current_size == 0:
+                self.status_var.set("ERROR: Heap " + str(heap_index) + " is empty. Choose a non-empty heap.")
+                return
+            
             if not (1 <= amount_to_remove <= current_size):
                 self.status_var.set("ERROR: Invalid remove amount. Must be 1 to " + str(current_size) + ".")
                 return
             
             # Apply the move
             self.heaps[heap_true_index] -= amount_to_remove
+            self.nim_sum ^= current_size ^ self.heaps[heap_true_index]
             
             self.log_move(f"OPPONENT MOVED: Removed {amount_to_remove} from Heap {heap_index}.")
 
             # Check for game end
-            if all(h == 0 for h in self.heaps):
+            if not any(self.heaps):
                 self.end_game("Opponent Wins!")
                 return
             
             # Log the state after opponent's move
-            self.heaps = [h for h in self.heaps if h > 0] # Remove 0 heaps
-            self.log_move(f"New State: {self.heaps} (Nim-sum: {calculate_nim_sum(self.heaps)})")
+            self.log_move(f"New State: {self.heaps} (Nim-sum: {self.nim_sum})")
 
             # Proceed to Player 1's turn
             self.analyze_current_state(player="Player 1 (You)")
@@ -252,12 +323,13 @@ class NimAdvisorApp:
     def end_game(self, message):
         """Handles the end of the game."""
         self.status_var.set("GAME OVER: " + message)
-        self.status_label.config(foreground='purple')
+        self.status_label.configure(style='Purple.TLabel')
         self.log_move(f"\n--- GAME OVER: {message} ---")
         
+        self.flush_log()
+        
         # Clear move frame
-        for widget in self.move_frame.winfo_children():
-            widget.destroy()
+        self.hide_move_widgets()
 
 if __name__ == "__main__":
     root = tk.Tk()